@@ -11,7 +11,7 @@ password='Password' # Your password, # This method is not very secure because yo
 workspace_id = "workspace_id"
 lakehouse_id = "lakehouse_id"
 src_folder = f"/folder_path" # Example: if your file is in Share Documents/DATA/2025 then add "/DATA/2025""
-src_file_name = f"EXAMPLE.xlsx"
+src_file_name = f"EXAMPLE.xlsx" # Set to None to copy every file in src_folder instead
 
 # Optional for specific ABFSS path
 #dest_folder = f"abfss://{'workspace_id'}@onelake.dfs.fabric.microsoft.com/{'lakehouse_id'}/Files/folder_path"
@@ -28,7 +28,12 @@ sp = SharePoint(
     USERNAME= username,
     PASSWORD= password
     )
-# Example get file from src folder in SharePoint and save to dest folder in Lakehouse
-sp.get_file(file_n=src_file_name, src_folder=src_folder,dest_folder=dest_folder)
-# Example get files from src folder in SharePoint and save to dest folder in Lakehouse
-sp.get_files(src_folder=src_folder,dest_folder=dest_folder)
\ No newline at end of file
+
+# Call either get_file or get_files, not both: get_files already copies src_file_name along with
+# the rest of the folder, and every call authenticates and lists the SharePoint folder again.
+if src_file_name:
+    # Example get file from src folder in SharePoint and save to dest folder in Lakehouse
+    sp.get_file(file_n=src_file_name, src_folder=src_folder,dest_folder=dest_folder)
+else:
+    # Example get files from src folder in SharePoint and save to dest folder in Lakehouse
+    sp.get_files(src_folder=src_folder,dest_folder=dest_folder)
\ No newline at end of file
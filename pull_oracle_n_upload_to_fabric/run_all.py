@@ -1,12 +1,51 @@
 import oracledb
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
+import mmap
+import queue
+import threading
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import sys
 import yaml
+from typing import Literal, Optional
+try:
+    from yaml import CSafeLoader as YamlSafeLoader # libyaml-backed loader, much faster when available
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt, PositiveInt, ValidationError, field_validator
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+from azure.identity import ClientSecretCredential
+from azure.storage.filedatalake import DataLakeServiceClient
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 # --- Load Environment Variables from .env file ---
 load_dotenv()
 
+# --- Logging ---
+# Records from every process go through LOG_QUEUE and are written by a listener thread in the
+# main process, so workers never contend for stdout or block on writing log lines.
+logger = logging.getLogger("run_all")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+LOG_QUEUE = multiprocessing.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(LOG_QUEUE))
+if multiprocessing.current_process().name == "MainProcess":
+    _log_stream_handler = logging.StreamHandler(sys.stdout)
+    _log_stream_handler.setFormatter(logging.Formatter("%(asctime)s [%(processName)s] %(message)s"))
+    _LOG_LISTENER = logging.handlers.QueueListener(LOG_QUEUE, _log_stream_handler)
+    _LOG_LISTENER.start()
+    atexit.register(_LOG_LISTENER.stop)
+
+def init_worker_logging(log_queue):
+    """Worker process initializer: sends the worker's log records to the main process's queue."""
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+
 # --- Azure Data Lake Upload Function (Provided by User) ---
 # This function is defined here so the script knows about it if called later.
 # Its actual implementation and required Azure libraries (azure.identity, azure.storage.filedatalake)
@@ -17,24 +56,88 @@ def load_yaml_config(config_path="config.yaml"): # Changed from config.json
     """Loads configuration from a YAML file."""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f) # Changed from json.load
-        print(f"Configuration successfully loaded from '{config_path}'.")
+            config = yaml.load(f, Loader=YamlSafeLoader) # Changed from json.load
+        logger.info(f"Configuration successfully loaded from '{config_path}'.")
         return config
     except FileNotFoundError:
-        print(f"ERROR: Configuration file '{config_path}' not found. Please create it.")
+        logger.error(f"ERROR: Configuration file '{config_path}' not found. Please create it.")
         return None
     except yaml.YAMLError as e: # Changed from json.JSONDecodeError
-        print(f"ERROR: Could not decode YAML from '{config_path}'. Check for syntax errors: {e}")
+        logger.error(f"ERROR: Could not decode YAML from '{config_path}'. Check for syntax errors: {e}")
         return None
     except Exception as e:
-        print(f"ERROR: An unexpected error occurred while loading YAML configuration: {e}")
+        logger.error(f"ERROR: An unexpected error occurred while loading YAML configuration: {e}")
         return None
 
+# --- Configuration Schema ---
+# Mirrors config.yaml. Validated once at startup so a typo or bad value stops the run
+# before any table is fetched, instead of failing in a worker after a long fetch.
+class TableConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    oracle_table_name: str = Field(min_length=1)
+    local_file_name: str = Field(min_length=1)
+    lakehouse_dest_folder_path: str = Field(min_length=1)
+    lakehouse_dest_file_name: str = Field(min_length=1)
+
+class OracleSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    thick_mode_lib_dir: Optional[str] = None
+
+class ProcessingSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    base_local_output_directory: str = "parquet_output"
+    tables_to_process: list[TableConfig] = []
+    cast_number_to_precision: int = Field(22, ge=1, le=38)
+    cast_number_to_scale: int = Field(0, ge=-84, le=127)
+    fetch_batch_size: PositiveInt = 50000 # Rows fetched from Oracle and written to Parquet per batch
+    oracle_fetch_arraysize: PositiveInt = 10000 # Rows per round-trip for regular cursors
+    oracle_statement_cache_size: NonNegativeInt = 100 # Statements cached per connection
+    parquet_compression: Literal["zstd", "snappy", "lz4", "gzip", "brotli", "none"] = "zstd"
+    parquet_compression_level: Optional[int] = None # None uses the codec default
+    row_group_size: PositiveInt = 512 * 1024 # Max rows per Parquet row group
+    data_page_size: PositiveInt = 1024 * 1024
+    dictionary_pagesize_limit: PositiveInt = 4 * 1024 * 1024
+    local_write_buffer_mib: PositiveInt = 8 # Write buffer for local Parquet files
+    upload_block_size_mib: PositiveInt = 16 # Size of each block uploaded in parallel
+    upload_max_concurrency: PositiveInt = 16 # Number of blocks uploaded concurrently
+    direct_upload: bool = False # Write Parquet straight to the Lakehouse, skipping local disk
+    max_workers: Optional[PositiveInt] = None # Defaults to min(number of tables, CPU count)
+    retry_max_attempts: PositiveInt = 5 # Attempts for Oracle/Fabric I/O that fails with a transient error
+    retry_max_wait_seconds: PositiveInt = 60 # Upper bound of the exponential backoff between attempts
+
+    @field_validator("tables_to_process", mode="before")
+    @classmethod
+    def none_as_no_tables(cls, value):
+        # "tables_to_process:" with no entries loads as None; treat it as an empty list
+        return [] if value is None else value
+
+class FabricLakehouseSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    workspace_id: Optional[str] = None
+    lakehouse_id: Optional[str] = None
+
+class AppConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    oracle_settings: OracleSettings = Field(default_factory=OracleSettings)
+    processing_settings: ProcessingSettings = Field(default_factory=ProcessingSettings)
+    fabric_lakehouse_settings: FabricLakehouseSettings = Field(default_factory=FabricLakehouseSettings)
+
 # --- Load Configurations ---
-APP_CONFIG = load_yaml_config()
-if not APP_CONFIG:
-    print("Exiting due to missing or invalid YAML configuration.")
-    exit()
+RAW_APP_CONFIG = load_yaml_config()
+if not RAW_APP_CONFIG:
+    logger.error("Exiting due to missing or invalid YAML configuration.")
+    sys.exit(1)
+
+try:
+    APP_CONFIG = AppConfig.model_validate(RAW_APP_CONFIG)
+except ValidationError as e:
+    logger.critical(f"CRITICAL ERROR: Invalid configuration in 'config.yaml':\n{e}")
+    sys.exit(1)
 
 # --- Database Credentials (from .env file) ---
 DB_USER = os.getenv("ORACLE_DB_USER")
@@ -48,52 +151,283 @@ FABRIC_CLIENT_SECRET = os.getenv("FABRIC_CLIENT_SECRET")
 
 # --- Oracle Client Configuration for Thick Mode ---
 ORACLE_CLIENT_LIB_DIR_ENV = os.getenv("ORACLE_CLIENT_LIB_DIR")
-ORACLE_SETTINGS_JSON = APP_CONFIG.get("oracle_settings", {})
-THICK_MODE_LIB_DIR_JSON = ORACLE_SETTINGS_JSON.get("thick_mode_lib_dir")
+THICK_MODE_LIB_DIR_JSON = APP_CONFIG.oracle_settings.thick_mode_lib_dir
 ORACLE_CLIENT_LIB_TO_USE = ORACLE_CLIENT_LIB_DIR_ENV if ORACLE_CLIENT_LIB_DIR_ENV else THICK_MODE_LIB_DIR_JSON
 
-# --- Processing Settings (from config.json) ---
-PROCESSING_SETTINGS = APP_CONFIG.get("processing_settings", {})
-BASE_LOCAL_OUTPUT_DIR = PROCESSING_SETTINGS.get("base_local_output_directory", "parquet_output") # Renamed
-TABLES_CONFIG_LIST = PROCESSING_SETTINGS.get("tables_to_process", []) # Now a list of objects
-CAST_PRECISION = PROCESSING_SETTINGS.get("cast_number_to_precision", 22)
-CAST_SCALE = PROCESSING_SETTINGS.get("cast_number_to_scale", 0)
-
-# --- Fabric Lakehouse Settings (from config.json) ---
-FABRIC_SETTINGS_JSON = APP_CONFIG.get("fabric_lakehouse_settings", {})
-FABRIC_WORKSPACE_ID = FABRIC_SETTINGS_JSON.get("workspace_id")
-FABRIC_LAKEHOUSE_ID = FABRIC_SETTINGS_JSON.get("lakehouse_id")
+# --- Processing Settings (from config.yaml) ---
+PROCESSING_SETTINGS = APP_CONFIG.processing_settings
+BASE_LOCAL_OUTPUT_DIR = PROCESSING_SETTINGS.base_local_output_directory
+# Plain dicts so they pickle cleanly into worker processes
+TABLES_CONFIG_LIST = [table_config.model_dump() for table_config in PROCESSING_SETTINGS.tables_to_process]
+CAST_PRECISION = PROCESSING_SETTINGS.cast_number_to_precision
+CAST_SCALE = PROCESSING_SETTINGS.cast_number_to_scale
+FETCH_BATCH_SIZE = PROCESSING_SETTINGS.fetch_batch_size
+ROW_GROUP_SIZE = PROCESSING_SETTINGS.row_group_size
+PARQUET_WRITER_OPTIONS = {
+    "compression": PROCESSING_SETTINGS.parquet_compression,
+    "compression_level": PROCESSING_SETTINGS.parquet_compression_level,
+    "data_page_size": PROCESSING_SETTINGS.data_page_size,
+    "dictionary_pagesize_limit": PROCESSING_SETTINGS.dictionary_pagesize_limit,
+}
+ORACLE_FETCH_ARRAYSIZE = PROCESSING_SETTINGS.oracle_fetch_arraysize
+LOCAL_WRITE_BUFFER_MIB = PROCESSING_SETTINGS.local_write_buffer_mib
+DIRECT_UPLOAD = PROCESSING_SETTINGS.direct_upload
+ORACLE_STMT_CACHE_SIZE = PROCESSING_SETTINGS.oracle_statement_cache_size
+MAX_WORKERS = PROCESSING_SETTINGS.max_workers
+UPLOAD_BLOCK_SIZE_MIB = PROCESSING_SETTINGS.upload_block_size_mib
+UPLOAD_MAX_CONCURRENCY = PROCESSING_SETTINGS.upload_max_concurrency
+RETRY_MAX_ATTEMPTS = PROCESSING_SETTINGS.retry_max_attempts
+RETRY_MAX_WAIT_SECONDS = PROCESSING_SETTINGS.retry_max_wait_seconds
+
+# --- Fabric Lakehouse Settings (from config.yaml) ---
+FABRIC_WORKSPACE_ID = APP_CONFIG.fabric_lakehouse_settings.workspace_id
+FABRIC_LAKEHOUSE_ID = APP_CONFIG.fabric_lakehouse_settings.lakehouse_id
 
 
 # --- Initialize Oracle Client for Thick Mode ---
 try:
     if ORACLE_CLIENT_LIB_TO_USE:
-        print(f"Attempting to initialize Oracle Client from: {ORACLE_CLIENT_LIB_TO_USE}")
+        logger.info(f"Attempting to initialize Oracle Client from: {ORACLE_CLIENT_LIB_TO_USE}")
         oracledb.init_oracle_client(lib_dir=ORACLE_CLIENT_LIB_TO_USE)
     else:
-        print("Attempting to initialize Oracle Client from system path (no specific lib_dir provided).")
+        logger.info("Attempting to initialize Oracle Client from system path (no specific lib_dir provided).")
         oracledb.init_oracle_client()
-    print("Successfully initialized Oracle Client in Thick Mode.")
+    logger.info("Successfully initialized Oracle Client in Thick Mode.")
 except Exception as e:
-    print(f"CRITICAL ERROR: Failed to initialize Oracle Client for Thick Mode: {e}")
-    exit()
+    logger.critical(f"CRITICAL ERROR: Failed to initialize Oracle Client for Thick Mode: {e}")
+    sys.exit(1)
+
+# --- Cursor Fetch Defaults ---
+# Applies to every cursor opened by this process (e.g. the metadata query). The Arrow batch
+# fetch in write_query_to_parquet uses fetch_batch_size as its array size instead.
+oracledb.defaults.arraysize = ORACLE_FETCH_ARRAYSIZE
+oracledb.defaults.prefetchrows = ORACLE_FETCH_ARRAYSIZE + 1
 
 # --- Validate Essential Configurations ---
 if not all([DB_USER, DB_PASSWORD, DB_DSN]):
-    print("CRITICAL ERROR: Oracle credentials (ORACLE_DB_USER, ORACLE_DB_PASSWORD, ORACLE_DB_DSN) not found. Please set them in your .env file.")
-    exit()
+    logger.critical("CRITICAL ERROR: Oracle credentials (ORACLE_DB_USER, ORACLE_DB_PASSWORD, ORACLE_DB_DSN) not found. Please set them in your .env file.")
+    sys.exit(1)
 
 if not TABLES_CONFIG_LIST:
-    print("WARNING: No tables specified in config.json under 'processing_settings.tables_to_process'.")
+    logger.warning("WARNING: No tables specified in config.yaml under 'processing_settings.tables_to_process'.")
 
 # Validate Fabric configs if uploads are intended
 FABRIC_CONFIG_COMPLETE = all([FABRIC_TENANT_ID, FABRIC_CLIENT_ID, FABRIC_CLIENT_SECRET, FABRIC_WORKSPACE_ID, FABRIC_LAKEHOUSE_ID])
 if not FABRIC_CONFIG_COMPLETE:
-    print("WARNING: Fabric Lakehouse connection details are incomplete (check .env for FABRIC_TENANT_ID, FABRIC_CLIENT_ID, FABRIC_CLIENT_SECRET and config.json for fabric_lakehouse_settings). Files will not be uploaded.")
+    logger.warning("WARNING: Fabric Lakehouse connection details are incomplete (check .env for FABRIC_TENANT_ID, FABRIC_CLIENT_ID, FABRIC_CLIENT_SECRET and config.json for fabric_lakehouse_settings). Files will not be uploaded.")
+    if DIRECT_UPLOAD:
+        logger.critical("CRITICAL ERROR: 'processing_settings.direct_upload' requires complete Fabric Lakehouse connection details.")
+        sys.exit(1)
+
+# --- Retry Policy for Transient Failures ---
+# Oracle errors that mean the connection was lost or could not be reached; retried on a new connection.
+TRANSIENT_ORACLE_ERROR_CODES = {
+    "ORA-03113", # end-of-file on communication channel
+    "ORA-03114", # not connected to ORACLE
+    "ORA-03135", # connection lost contact
+    "ORA-12170", # connect timeout
+    "ORA-12537", # TNS: connection closed
+    "ORA-12541", # TNS: no listener
+    "ORA-12543", # TNS: destination host unreachable
+    "ORA-12547", # TNS: lost contact
+    "DPI-1080",  # connection was closed
+}
+
+def is_transient_error(exc):
+    """Returns True for network-level Oracle and Azure errors that are worth retrying."""
+    if isinstance(exc, (ServiceRequestError, ServiceResponseError)):
+        return True
+    if isinstance(exc, oracledb.DatabaseError) and exc.args:
+        error = exc.args[0]
+        return getattr(error, "isrecoverable", False) or getattr(error, "full_code", None) in TRANSIENT_ORACLE_ERROR_CODES
+    return False
+
+def log_before_retry(retry_state):
+    """tenacity before_sleep hook: logs the failed attempt and the upcoming wait."""
+    logger.warning(
+        f"  WARNING: Transient error in {retry_state.fn.__name__} (attempt {retry_state.attempt_number} of {RETRY_MAX_ATTEMPTS}): "
+        f"{retry_state.outcome.exception()}. Retrying in {retry_state.next_action.sleep:.0f}s..."
+    )
+
+retry_transient = retry(
+    stop=stop_after_attempt(RETRY_MAX_ATTEMPTS),
+    wait=wait_exponential(multiplier=1, max=RETRY_MAX_WAIT_SECONDS),
+    retry=retry_if_exception(is_transient_error),
+    before_sleep=log_before_retry,
+    reraise=True
+)
+
+@retry_transient
+def upload_local_file(file_client, local_file_path, block_size_mib, max_concurrency):
+    """
+    Uploads a local file to a Data Lake file, letting the SDK upload blocks in parallel.
+    The file is memory-mapped and its size passed up front, so the SDK reads straight
+    from the page cache without probing the stream's length.
+    """
+    total_size = os.path.getsize(local_file_path)
+    if total_size == 0:
+        file_client.upload_data(b"", overwrite=True)
+        return
+
+    with open(local_file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        file_client.upload_data(
+            mm,
+            length=total_size,
+            overwrite=True,
+            max_concurrency=max_concurrency,
+            chunk_size=block_size_mib * 1024 * 1024
+        )
+
+# File system clients cached per (tenant_id, client_id, workspace_id) for the lifetime of the process,
+# so the credential's AAD token is reused across uploads instead of requested once per file.
+_FABRIC_FILE_SYSTEM_CLIENTS = {}
+
+def get_file_system_client(tenant_id, client_id, client_secret, workspace_id):
+    """Returns a cached FileSystemClient for the given OneLake workspace, creating it on first use."""
+    cache_key = (tenant_id, client_id, workspace_id)
+    file_system_client = _FABRIC_FILE_SYSTEM_CLIENTS.get(cache_key)
+    if file_system_client is None:
+        # URL for the Data Lake Storage account
+        account_url = "https://onelake.dfs.fabric.microsoft.com"
+
+        # Authenticate using ClientSecretCredential
+        credential = ClientSecretCredential(tenant_id, client_id, client_secret)
+
+        # Create a DataLakeServiceClient instance
+        service_client = DataLakeServiceClient(account_url, credential=credential)
+
+        # Get a FileSystemClient for the specified workspace
+        file_system_client = service_client.get_file_system_client(workspace_id)
+        _FABRIC_FILE_SYSTEM_CLIENTS[cache_key] = file_system_client
+    return file_system_client
+
+def get_lakehouse_file_client(tenant_id, client_id, client_secret, workspace_id, lakehouse_id, dest_folder_path, dest_file_name):
+    """Returns a DataLakeFileClient for Files/<dest_folder_path>/<dest_file_name> in the lakehouse."""
+    file_system_client = get_file_system_client(tenant_id, client_id, client_secret, workspace_id)
+
+    # Get a DirectoryClient for the specified path in the lakehouse
+    directory_client = file_system_client.get_directory_client(f"{lakehouse_id}/Files/{dest_folder_path}")
 
-def upload_file_to_datalake(tenant_id, client_id, client_secret, workspace_id, lakehouse_id, local_file_path, dest_folder_path, dest_file_name):
+    return directory_client.get_file_client(dest_file_name)
+
+class ParallelBlockAppender:
+    """
+    Appends blocks to a Data Lake file from a bounded thread pool. Each block's offset is fixed
+    when it is submitted, so blocks may complete in any order; commit() waits for all of them and
+    flushes the file. At most max_concurrency blocks are in flight, which also bounds memory.
     """
-    Uploads a file to Fabric Data Lake.
+
+    def __init__(self, file_client, max_concurrency):
+        self.file_client = file_client
+        self.size = 0 # Bytes submitted so far, i.e. the offset of the next block
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._futures = []
+
+    def submit(self, data):
+        """Queues a bytes block to be appended at the current end of the file, waiting while max_concurrency blocks are in flight."""
+        offset = self.size
+        self.size += len(data)
+        self._slots.acquire()
+        future = self._executor.submit(self.file_client.append_data, data, offset=offset, length=len(data))
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        self._raise_first_failure()
+
+    def _raise_first_failure(self):
+        # Fail fast on an append error and drop finished futures so the list stays short
+        pending = []
+        for future in self._futures:
+            if not future.done():
+                pending.append(future)
+            elif future.exception() is not None:
+                raise future.exception()
+        self._futures = pending
+
+    def commit(self):
+        """Waits for every queued block, then flushes the file so its contents become visible."""
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._futures = []
+            self._executor.shutdown(wait=True)
+        self.file_client.flush_data(self.size)
+
+    def abort(self):
+        """Cancels blocks that have not started and waits for the running ones. Nothing is flushed."""
+        self._futures = []
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+class LakehouseFileStream:
+    """
+    Write-only file object that streams bytes into a Lakehouse file with append_data, so pyarrow
+    can write Parquet straight to OneLake. Full blocks are appended in parallel by a
+    ParallelBlockAppender while the writer keeps going; appended data only becomes visible on commit().
+    """
+
+    def __init__(self, file_client, block_size_mib, max_concurrency):
+        self.file_client = file_client
+        self.block_size = block_size_mib * 1024 * 1024
+        self._buffer = bytearray()
+        self._position = 0 # Bytes received from the writer
+        self._finished = False
+        self.file_client.create_file()
+        self._appender = ParallelBlockAppender(file_client, max_concurrency)
+
+    @property
+    def closed(self):
+        return self._finished
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def write(self, data):
+        length = memoryview(data).nbytes
+        self._buffer += data
+        self._position += length
+        if len(self._buffer) >= self.block_size:
+            self._append_buffer()
+        return length
+
+    def flush(self):
+        # Data is committed in commit(); nothing to do for intermediate flushes.
+        pass
+
+    def close(self):
+        # Ownership stays with the caller, which decides between commit() and abort().
+        pass
+
+    def _append_buffer(self):
+        if self._buffer:
+            self._appender.submit(bytes(self._buffer))
+            self._buffer = bytearray()
+
+    def commit(self):
+        """Appends any buffered bytes, waits for all in-flight blocks and flushes the file, making its contents visible."""
+        if self._finished: return
+        self._append_buffer()
+        self._appender.commit()
+        self._finished = True
+
+    def abort(self):
+        """Cancels pending appends, discards the written data and deletes the partially written file."""
+        if self._finished: return
+        self._finished = True
+        self._buffer = bytearray()
+        self._appender.abort()
+        try:
+            self.file_client.delete_file()
+        except Exception as e:
+            logger.warning(f"  WARNING: Could not delete partially written Lakehouse file '{self.file_client.path_name}': {e}")
+
+def upload_file_to_datalake(tenant_id, client_id, client_secret, workspace_id, lakehouse_id, local_file_path, dest_folder_path, dest_file_name,
+                            block_size_mib=UPLOAD_BLOCK_SIZE_MIB, max_concurrency=UPLOAD_MAX_CONCURRENCY):
+    """
+    Uploads a file to Fabric Data Lake, reusing the process-wide client for the workspace.
 
     Parameters:
     tenant_id (str): The Azure Active Directory tenant ID.
@@ -104,197 +438,450 @@ def upload_file_to_datalake(tenant_id, client_id, client_secret, workspace_id, l
     local_file_path (str): The local path of the file to be uploaded.
     dest_folder_path (str): The destination folder path within the lakehouse.
     dest_file_name (str): The name of the file in the destination folder.
+    block_size_mib (int): The size in MiB of each block uploaded to the remote file.
+    max_concurrency (int): The number of blocks uploaded in parallel.
 
     Returns:
-    None
+    bool: True if the upload succeeded, False otherwise.
     """
-    
-    from azure.identity import ClientSecretCredential
-    from azure.storage.filedatalake import DataLakeServiceClient
-    # Azure Data Lake Storage account details
-    account_name = "onelake"
-  
     # Construct the destination folder path within the lakehouse
     full_dest_folder_path = f"Files/{dest_folder_path}"
 
     # Construct the full path in the lakehouse
     data_path = f"{lakehouse_id}/{full_dest_folder_path}"
 
-    # URL for the Data Lake Storage account
-    account_url = f"https://{account_name}.dfs.fabric.microsoft.com"
-
     try:
-        # Authenticate using ClientSecretCredential
-        credential = ClientSecretCredential(tenant_id, client_id, client_secret)
+        # Get a FileClient for the file to be uploaded (upload_data creates or overwrites it)
+        file_client = get_lakehouse_file_client(tenant_id, client_id, client_secret, workspace_id, lakehouse_id, dest_folder_path, dest_file_name)
 
-        # Create a DataLakeServiceClient instance
-        service_client = DataLakeServiceClient(account_url, credential=credential)
+        # Upload the local file to the Data Lake in parallel blocks
+        upload_local_file(file_client, local_file_path, block_size_mib, max_concurrency)
 
-        # Get a FileSystemClient for the specified workspace
-        file_system_client = service_client.get_file_system_client(workspace_id)
-
-        # Get a DirectoryClient for the specified path in the lakehouse
-        directory_client = file_system_client.get_directory_client(data_path)
-
-        # Create a FileClient for the file to be uploaded
-        file_client = directory_client.create_file(dest_file_name)
-
-        # Upload the local file to the Data Lake
-        with open(local_file_path, "rb") as data:
-            file_client.upload_data(data, overwrite=True)
-
-        print(f"File '{dest_file_name}' uploaded successfully to '{data_path}'")
+        logger.info(f"File '{dest_file_name}' uploaded successfully to '{data_path}'")
+        return True
 
     except Exception as e:
-        print(f"  ERROR uploading file '{local_file_path}' to Lakehouse: {e}")
-        print(f"  Attempted Lakehouse path: {full_dest_folder_path}/{dest_file_name}")
+        logger.error(f"  ERROR uploading file '{local_file_path}' to Lakehouse: {e}")
+        logger.error(f"  Attempted Lakehouse path: {full_dest_folder_path}/{dest_file_name}")
+        return False
+
+def open_oracle_connection(user, password, dsn):
+    """Opens an Oracle connection with the statement cache enabled. Raises oracledb errors."""
+    conn = oracledb.connect(user=user, password=password, dsn=dsn)
+    # Cache parsed statements for the session so repeated queries skip the soft parse
+    conn.stmtcachesize = ORACLE_STMT_CACHE_SIZE
+    return conn
 
 def get_oracle_connection(user, password, dsn):
-    """Establishes a connection to the Oracle database."""
+    """Establishes a connection to the Oracle database, retrying transient failures."""
     try:
-        conn = oracledb.connect(user=user, password=password, dsn=dsn)
-        print(f"Successfully connected to Oracle as user '{user}' with DSN '{dsn}'.")
+        conn = retry_transient(open_oracle_connection)(user, password, dsn)
+        logger.info(f"Successfully connected to Oracle as user '{user}' with DSN '{dsn}'.")
         return conn
     except oracledb.DatabaseError as e:
-        print(f"Error connecting to Oracle: {e}")
+        logger.error(f"Error connecting to Oracle: {e}")
         return None
 
-def get_table_column_metadata(connection, owner_name, table_name_only):
-    """Retrieves column names and data types for a given table."""
-    query = "SELECT COLUMN_NAME, DATA_TYPE FROM ALL_TAB_COLUMNS WHERE OWNER = :owner_name AND TABLE_NAME = :table_name_only ORDER BY COLUMN_ID"
+def get_current_schema(connection):
+    """Returns the connection's current schema, or None if it cannot be determined."""
     try:
         with connection.cursor() as cursor:
-            cursor.execute(query, owner_name=owner_name.upper(), table_name_only=table_name_only.upper())
-            return cursor.fetchall()
+            cursor.execute("SELECT SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA') FROM DUAL")
+            fetched_owner = cursor.fetchone()
+            return fetched_owner[0] if fetched_owner else None
     except oracledb.DatabaseError as e:
-        print(f"Error fetching metadata for {owner_name}.{table_name_only}: {e}")
-        return []
-
-def generate_select_query(owner_name, table_name_only, column_metadata, precision, scale):
-    """Generates a SELECT query, casting NUMBER types."""
-    if not column_metadata: return None
-    select_clauses = [f'CAST("{c}" AS NUMBER({precision},{scale})) AS "{c}"' if dt == "NUMBER" else f'"{c}"' for c, dt in column_metadata]
-    if not select_clauses: return None
-    return f"SELECT\n  {',\n  '.join(select_clauses)}\nFROM \"{owner_name.upper()}\".\"{table_name_only.upper()}\""
+        logger.error(f"Error getting current schema: {e}")
+        return None
 
-def process_table(connection, oracle_table_full_name, local_output_dir, local_file_name_cfg, cast_prec, cast_scl):
+def resolve_table_name(oracle_table_full_name, default_owner):
     """
-    Processes a single table: generates query, fetches data, saves to Parquet locally.
-    Returns the full path to the locally saved Parquet file, or None on failure.
+    Splits a configured table name into upper-cased (owner, table), using default_owner
+    (the connection's current schema) when no owner is given. Returns None on failure.
     """
-    print(f"\nProcessing Oracle table: {oracle_table_full_name}...")
-
     if '.' in oracle_table_full_name:
         owner_name, table_name_only = oracle_table_full_name.split('.', 1)
+    elif default_owner:
+        owner_name, table_name_only = default_owner, oracle_table_full_name
     else:
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA') FROM DUAL")
-                fetched_owner = cursor.fetchone()
-                if fetched_owner: owner_name = fetched_owner[0]
-                else:
-                    print(f"Could not determine current schema for table {oracle_table_full_name}. Skipping.")
-                    return None
-        except oracledb.DatabaseError as e:
-            print(f"Error getting current schema for {oracle_table_full_name}: {e}. Skipping.")
-            return None
-        table_name_only = oracle_table_full_name
-    
-    owner_name_std = owner_name.upper()
-    table_name_only_std = table_name_only.upper()
-
-    column_metadata = get_table_column_metadata(connection, owner_name_std, table_name_only_std)
-    if not column_metadata:
-        print(f"Could not retrieve metadata for {owner_name_std}.{table_name_only_std}. Skipping.")
+        logger.error(f"Could not determine current schema for table {oracle_table_full_name}. Skipping.")
         return None
-    print(f"  Column metadata retrieved for {oracle_table_full_name}.")
+    return owner_name.upper(), table_name_only.upper()
 
-    select_query = generate_select_query(owner_name_std, table_name_only_std, column_metadata, cast_prec, cast_scl)
-    if not select_query:
-        print(f"Could not generate SELECT query for {owner_name_std}.{table_name_only_std}. Skipping.")
-        return None
+def get_tables_column_metadata(connection, table_keys, chunk_size=500):
+    """
+    Retrieves column names, data types, precision and scale for many tables in a single
+    dictionary query (one per chunk_size tables, to stay under Oracle's IN-list limit).
+    table_keys is a list of upper-cased (owner, table) pairs.
+    Returns a dict mapping (owner, table) to its list of (column, data_type, precision, scale).
+    """
+    metadata = {}
+    unique_keys = list(dict.fromkeys(table_keys))
+    try:
+        with connection.cursor() as cursor:
+            for start in range(0, len(unique_keys), chunk_size):
+                chunk = unique_keys[start:start + chunk_size]
+                in_list = ", ".join(f"(:o{i}, :t{i})" for i in range(len(chunk)))
+                binds = {}
+                for i, (owner_name, table_name_only) in enumerate(chunk):
+                    binds[f"o{i}"] = owner_name
+                    binds[f"t{i}"] = table_name_only
+                query = (
+                    "SELECT OWNER, TABLE_NAME, COLUMN_NAME, DATA_TYPE, DATA_PRECISION, DATA_SCALE FROM ALL_TAB_COLUMNS "
+                    f"WHERE (OWNER, TABLE_NAME) IN ({in_list}) ORDER BY OWNER, TABLE_NAME, COLUMN_ID"
+                )
+                cursor.execute(query, binds)
+                for owner_name, table_name_only, column_name, data_type, data_precision, data_scale in cursor:
+                    metadata.setdefault((owner_name, table_name_only), []).append((column_name, data_type, data_precision, data_scale))
+    except oracledb.DatabaseError as e:
+        logger.error(f"Error fetching column metadata: {e}")
+    return metadata
+
+def number_needs_cast(data_precision, data_scale, precision, scale):
+    """Returns True if a NUMBER column is not already declared as NUMBER(precision, scale)."""
+    return data_precision is None or data_precision != precision or (data_scale or 0) != scale
+
+def generate_select_query(owner_name, table_name_only, column_metadata, precision, scale):
+    """Generates a SELECT query, casting NUMBER types that do not already match the target precision/scale."""
+    if not column_metadata: return None
+    select_clauses = [
+        f'CAST("{c}" AS NUMBER({precision},{scale})) AS "{c}"'
+        if dt == "NUMBER" and number_needs_cast(dp, ds, precision, scale) else f'"{c}"'
+        for c, dt, dp, ds in column_metadata
+    ]
+    if not select_clauses: return None
+    columns_sql = ",\n  ".join(select_clauses)
+    return f"SELECT\n  {columns_sql}\nFROM \"{owner_name.upper()}\".\"{table_name_only.upper()}\""
 
+def oracle_df_to_arrow(odf):
+    """Converts an oracledb DataFrame into a pyarrow Table without copying through pandas."""
+    return pa.Table.from_arrays(odf.column_arrays(), names=odf.column_names())
+
+FETCH_QUEUE_MAX_BATCHES = 4 # Batches buffered between the fetch thread and the Parquet writer
+_END_OF_BATCHES = object()
+
+def put_unless_stopped(batch_queue, item, stop_event):
+    """Puts item on a bounded queue, giving up if stop_event is set while waiting. Returns True if the item was queued."""
+    while not stop_event.is_set():
+        try:
+            batch_queue.put(item, timeout=1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def fetch_batches_to_queue(connection, select_query, batch_size, batch_queue, stop_event):
+    """
+    Fetch stage: pulls Arrow batches from Oracle and puts them on batch_queue, followed by
+    _END_OF_BATCHES, or by the exception that stopped the fetch.
+    """
     try:
-        print(f"  Executing query and fetching data for {oracle_table_full_name}...")
-        df = pd.read_sql_query(select_query, connection)
-        print(f"  Successfully fetched {len(df)} rows for {oracle_table_full_name}.")
+        # batch_size is also used as the cursor array size, so each round-trip fetches a whole batch
+        for odf in connection.fetch_df_batches(statement=select_query, size=batch_size):
+            if not put_unless_stopped(batch_queue, oracle_df_to_arrow(odf), stop_event):
+                return
+        item = _END_OF_BATCHES
+    except Exception as e:
+        item = e
+    put_unless_stopped(batch_queue, item, stop_event)
 
-        if not os.path.exists(local_output_dir):
-            os.makedirs(local_output_dir)
-            print(f"  Created local output directory: {local_output_dir}")
+def write_query_to_parquet(connection, select_query, parquet_sink, batch_size, parquet_options, row_group_size):
+    """
+    Streams the result of a query into a Parquet file (local path or writable file object)
+    one Arrow batch at a time.
+    Fetching runs in a background thread so the next batch is read from Oracle while the
+    current one is encoded; up to FETCH_QUEUE_MAX_BATCHES batches wait in the queue.
+    parquet_options are passed to pyarrow's ParquetWriter (compression, page sizes, ...).
+    Small batches are accumulated until they fill a row group and written as one contiguous
+    table, so each row group is encoded from a single chunk instead of many small ones.
+    Peak memory is therefore about one row group: the pending rows plus the contiguous copy
+    made when they are combined, on top of the queued batches.
+    Returns the number of rows written. On failure the file is still closed but holds only
+    part of the result; callers discard it.
+    """
+    batch_queue = queue.Queue(maxsize=FETCH_QUEUE_MAX_BATCHES)
+    stop_event = threading.Event()
+    fetch_thread = threading.Thread(
+        target=fetch_batches_to_queue,
+        args=(connection, select_query, batch_size, batch_queue, stop_event),
+        daemon=True
+    )
+    writer = None
+    num_rows = 0
+    pending_tables = []
+    pending_rows = 0
+
+    def write_pending(final=False):
+        # Write whole row groups only; rows past the last full group wait for the next batch
+        table = pa.concat_tables(pending_tables).combine_chunks()
+        rows_to_write = table.num_rows if final else table.num_rows - table.num_rows % row_group_size
+        writer.write_table(table.slice(0, rows_to_write), row_group_size=row_group_size)
+        pending_tables.clear()
+        if rows_to_write < table.num_rows:
+            pending_tables.append(table.slice(rows_to_write))
+        return table.num_rows - rows_to_write
+
+    fetch_thread.start()
+    try:
+        while True:
+            item = batch_queue.get()
+            if item is _END_OF_BATCHES:
+                break
+            if isinstance(item, Exception):
+                raise item
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_sink, item.schema, **parquet_options)
+            pending_tables.append(item)
+            pending_rows += item.num_rows
+            num_rows += item.num_rows
+            if pending_rows >= row_group_size:
+                pending_rows = write_pending()
+
+        if pending_tables:
+            write_pending(final=True)
+
+        if writer is None:
+            # Empty result set: no batches were produced, fetch once more just to get the schema.
+            table = oracle_df_to_arrow(connection.fetch_df_all(statement=select_query))
+            writer = pq.ParquetWriter(parquet_sink, table.schema, **parquet_options)
+            writer.write_table(table, row_group_size=row_group_size)
+    finally:
+        stop_event.set()
+        fetch_thread.join()
+        if writer is not None:
+            writer.close()
+    return num_rows
+
+def process_table(connection, oracle_table_full_name, select_query, local_output_dir, local_file_name_cfg, batch_size, parquet_options, row_group_size, lakehouse_stream=None):
+    """
+    Processes a single table: runs its pre-generated SELECT query and saves the data to
+    Parquet locally, or straight into lakehouse_stream (a LakehouseFileStream) when one is given.
+    Returns the path of the saved Parquet file, or None on failure.
+    """
+    logger.info(f"Processing Oracle table: {oracle_table_full_name}...")
 
+    if lakehouse_stream is not None:
+        try:
+            logger.info(f"  Executing query and streaming data for {oracle_table_full_name} directly to Lakehouse file '{lakehouse_stream.file_client.path_name}'...")
+            num_rows = write_query_to_parquet(connection, select_query, lakehouse_stream, batch_size, parquet_options, row_group_size)
+            lakehouse_stream.commit()
+            logger.info(f"  Successfully saved {num_rows} rows for {oracle_table_full_name} to Lakehouse file: {lakehouse_stream.file_client.path_name}")
+            return lakehouse_stream.file_client.path_name
+        except Exception as e:
+            lakehouse_stream.abort()
+            if is_transient_error(e): raise # Retried with a new connection and stream by fetch_table_with_retry
+            logger.error(f"  ERROR writing {oracle_table_full_name} directly to Lakehouse: {e}")
+            return None
+
+    try:
         # Construct full local file path using the configured local_file_name
         local_parquet_file_path = os.path.join(local_output_dir, local_file_name_cfg)
 
-        df.to_parquet(local_parquet_file_path, index=False, engine='pyarrow')
-        print(f"  Successfully saved data for {oracle_table_full_name} to local file: {local_parquet_file_path}")
+        logger.info(f"  Executing query and streaming data for {oracle_table_full_name} in batches of {batch_size} rows...")
+        # Write under a temporary name and move it into place only once complete, so a failed
+        # fetch never leaves a truncated but readable Parquet file at the real path
+        partial_parquet_file_path = local_parquet_file_path + ".partial"
+        try:
+            # Buffer the Parquet output so the encoder's many small writes reach the disk as a few large ones.
+            # compression=None: Parquet compresses its own pages, so never wrap it in a stream codec picked from the file name
+            with pa.output_stream(partial_parquet_file_path, compression=None, buffer_size=LOCAL_WRITE_BUFFER_MIB * 1024 * 1024) as local_sink:
+                num_rows = write_query_to_parquet(connection, select_query, local_sink, batch_size, parquet_options, row_group_size)
+            os.replace(partial_parquet_file_path, local_parquet_file_path)
+        finally:
+            if os.path.exists(partial_parquet_file_path):
+                os.remove(partial_parquet_file_path)
+        logger.info(f"  Successfully saved {num_rows} rows for {oracle_table_full_name} to local file: {local_parquet_file_path}")
         return local_parquet_file_path # Return the path for the upload step
 
     except oracledb.DatabaseError as e:
-        print(f"  Oracle Error processing {oracle_table_full_name}: {e}")
-    except pd.errors.DatabaseError as e: 
-        print(f"  Pandas Database Error for {oracle_table_full_name}: {e}")
+        if is_transient_error(e): raise # Retried with a new connection by fetch_table_with_retry
+        logger.error(f"  Oracle Error processing {oracle_table_full_name}: {e}")
+    except pa.ArrowException as e:
+        logger.error(f"  Arrow/Parquet Error for {oracle_table_full_name}: {e}")
     except Exception as e:
-        print(f"  An unexpected error occurred while processing {oracle_table_full_name}: {e}")
+        if is_transient_error(e): raise
+        logger.error(f"  An unexpected error occurred while processing {oracle_table_full_name}: {e}")
     return None
 
-def main():
-    """Main function to connect to Oracle, process tables, and upload to Fabric Lakehouse."""
-    print("--- Starting Oracle to Parquet Script with Lakehouse Upload ---")
-    
-    conn = get_oracle_connection(DB_USER, DB_PASSWORD, DB_DSN)
+@retry_transient
+def fetch_table_with_retry(oracle_table_name, select_query, local_output_dir, local_file_name, lakehouse_folder, lakehouse_file, batch_size, parquet_options, row_group_size):
+    """
+    Opens a fresh Oracle connection (and Lakehouse stream, when direct_upload is enabled) and
+    saves the table via process_table. Transient failures are retried with exponential backoff,
+    reconnecting on every attempt so a dropped connection is never reused.
+    Returns the path of the saved Parquet file, or None on a non-transient failure.
+    """
+    conn = open_oracle_connection(DB_USER, DB_PASSWORD, DB_DSN)
+    try:
+        lakehouse_stream = None
+        if DIRECT_UPLOAD:
+            file_client = get_lakehouse_file_client(
+                FABRIC_TENANT_ID, FABRIC_CLIENT_ID, FABRIC_CLIENT_SECRET,
+                FABRIC_WORKSPACE_ID, FABRIC_LAKEHOUSE_ID, lakehouse_folder, lakehouse_file
+            )
+            lakehouse_stream = LakehouseFileStream(file_client, UPLOAD_BLOCK_SIZE_MIB, UPLOAD_MAX_CONCURRENCY)
+
+        # Process table and get local Parquet file path
+        return process_table(
+            conn,
+            oracle_table_name,
+            select_query,
+            local_output_dir,
+            local_file_name,
+            batch_size,
+            parquet_options,
+            row_group_size,
+            lakehouse_stream
+        )
+    finally:
+        conn.close()
+
+def pipeline_one_table(table_config, select_query, local_output_dir, batch_size, parquet_options, row_group_size):
+    """
+    Runs the full pipeline for a single table: opens its own Oracle connection, saves the
+    table to a local Parquet file and uploads it to the Lakehouse, or writes it straight to
+    the Lakehouse when direct_upload is enabled.
+    Self-contained so it can run in a worker process alongside other tables.
+    Returns True if the table was saved (and uploaded, when Fabric is configured), False otherwise.
+    """
+    oracle_table_name = table_config.get("oracle_table_name")
+    local_file_name = table_config.get("local_file_name")
+    lakehouse_folder = table_config.get("lakehouse_dest_folder_path")
+    lakehouse_file = table_config.get("lakehouse_dest_file_name")
 
-    if conn:
-        try:
-            if not TABLES_CONFIG_LIST:
-                print("No tables to process. Check 'tables_to_process' in config.json.")
-            else:
-                print(f"Base local output directory: {BASE_LOCAL_OUTPUT_DIR}")
-                print(f"Casting NUMBER types to: NUMBER({CAST_PRECISION},{CAST_SCALE})")
-
-                for table_config in TABLES_CONFIG_LIST:
-                    oracle_table_name = table_config.get("oracle_table_name")
-                    local_file_name = table_config.get("local_file_name")
-                    lakehouse_folder = table_config.get("lakehouse_dest_folder_path")
-                    lakehouse_file = table_config.get("lakehouse_dest_file_name")
-
-                    if not all([oracle_table_name, local_file_name, lakehouse_folder, lakehouse_file]):
-                        print(f"WARNING: Skipping table configuration due to missing fields: {table_config}")
-                        continue
-                    
-                    # Process table and get local Parquet file path
-                    local_parquet_path = process_table(
-                        conn, 
-                        oracle_table_name, 
-                        BASE_LOCAL_OUTPUT_DIR, 
-                        local_file_name, 
-                        CAST_PRECISION, 
-                        CAST_SCALE
-                    )
-
-                    if local_parquet_path and FABRIC_CONFIG_COMPLETE:
-                        print(f"  Attempting to upload '{local_file_name}' to Lakehouse folder '{lakehouse_folder}' as '{lakehouse_file}'...")
-                        upload_file_to_datalake(
-                            tenant_id=FABRIC_TENANT_ID,
-                            client_id=FABRIC_CLIENT_ID,
-                            client_secret=FABRIC_CLIENT_SECRET,
-                            workspace_id=FABRIC_WORKSPACE_ID,
-                            lakehouse_id=FABRIC_LAKEHOUSE_ID,
-                            local_file_path=local_parquet_path,
-                            dest_folder_path=lakehouse_folder,
-                            dest_file_name=lakehouse_file
-                        )
-                    elif local_parquet_path and not FABRIC_CONFIG_COMPLETE:
-                        print(f"  Skipping upload for '{local_file_name}' due to incomplete Fabric configurations.")
-                    else:
-                        print(f"  Skipping upload for '{oracle_table_name}' as local Parquet file was not created.")
-        finally:
-            print("\nClosing Oracle connection.")
-            conn.close()
+    try:
+        local_parquet_path = fetch_table_with_retry(
+            oracle_table_name,
+            select_query,
+            local_output_dir,
+            local_file_name,
+            lakehouse_folder,
+            lakehouse_file,
+            batch_size,
+            parquet_options,
+            row_group_size
+        )
+    except Exception as e:
+        logger.error(f"  ERROR: Could not process {oracle_table_name}: {e}. Skipping.")
+        return False
+
+    if DIRECT_UPLOAD:
+        return bool(local_parquet_path)
+    elif local_parquet_path and FABRIC_CONFIG_COMPLETE:
+        logger.info(f"  Attempting to upload '{local_file_name}' to Lakehouse folder '{lakehouse_folder}' as '{lakehouse_file}'...")
+        return upload_file_to_datalake(
+            tenant_id=FABRIC_TENANT_ID,
+            client_id=FABRIC_CLIENT_ID,
+            client_secret=FABRIC_CLIENT_SECRET,
+            workspace_id=FABRIC_WORKSPACE_ID,
+            lakehouse_id=FABRIC_LAKEHOUSE_ID,
+            local_file_path=local_parquet_path,
+            dest_folder_path=lakehouse_folder,
+            dest_file_name=lakehouse_file
+        )
+    elif local_parquet_path and not FABRIC_CONFIG_COMPLETE:
+        logger.info(f"  Skipping upload for '{local_file_name}' due to incomplete Fabric configurations.")
+        return True
     else:
-        print("Could not establish Oracle connection. Exiting.")
-    
-    print("\n--- Script Finished ---")
+        logger.info(f"  Skipping upload for '{oracle_table_name}' as local Parquet file was not created.")
+        return False
+
+def prepare_tables(connection, tables_config_list, cast_prec, cast_scl):
+    """
+    Resolves each table's owner (querying the current
+    schema at most once), fetches the column metadata of all tables in one query and
+    generates each table's SELECT query once.
+    Returns a list of (table_config, owner, table, select_query) for the tables that can be
+    processed and the list of table names that were skipped.
+    """
+    resolved_tables = []
+    skipped_tables = []
+    default_owner = None
+    current_schema_fetched = False
+    for table_config in tables_config_list:
+        if '.' not in table_config["oracle_table_name"] and not current_schema_fetched:
+            # The current schema cannot change within a connection, so look it up only once
+            default_owner = get_current_schema(connection)
+            current_schema_fetched = True
+        table_key = resolve_table_name(table_config["oracle_table_name"], default_owner)
+        if table_key:
+            resolved_tables.append((table_config, table_key))
+        else:
+            skipped_tables.append(table_config["oracle_table_name"])
+
+    metadata = get_tables_column_metadata(connection, [table_key for _, table_key in resolved_tables])
+    logger.info(f"Column metadata retrieved for {len(metadata)} of {len(resolved_tables)} table(s).")
+
+    tables_to_run = []
+    for table_config, (owner_name, table_name_only) in resolved_tables:
+        column_metadata = metadata.get((owner_name, table_name_only))
+        if not column_metadata:
+            logger.error(f"Could not retrieve metadata for {owner_name}.{table_name_only}. Skipping.")
+            skipped_tables.append(table_config["oracle_table_name"])
+            continue
+        select_query = generate_select_query(owner_name, table_name_only, column_metadata, cast_prec, cast_scl)
+        if not select_query:
+            logger.error(f"Could not generate SELECT query for {owner_name}.{table_name_only}. Skipping.")
+            skipped_tables.append(table_config["oracle_table_name"])
+            continue
+        tables_to_run.append((table_config, owner_name, table_name_only, select_query))
+    return tables_to_run, skipped_tables
+
+def main():
+    """Main function to process tables in parallel worker processes and upload them to Fabric Lakehouse."""
+    logger.info("--- Starting Oracle to Parquet Script with Lakehouse Upload ---")
+
+    if not TABLES_CONFIG_LIST:
+        logger.info("No tables to process. Check 'tables_to_process' in config.json.")
+        logger.info("--- Script Finished ---")
+        return
+
+    conn = get_oracle_connection(DB_USER, DB_PASSWORD, DB_DSN)
+    if not conn:
+        logger.error("Could not establish Oracle connection. Exiting.")
+        return
+    try:
+        tables_to_run, failed_tables = prepare_tables(conn, TABLES_CONFIG_LIST, CAST_PRECISION, CAST_SCALE)
+    finally:
+        # Workers open their own connections; don't keep this one open across the pool
+        conn.close()
+
+    if tables_to_run:
+        if not DIRECT_UPLOAD:
+            # Created once here rather than per table, so parallel workers never race on it
+            os.makedirs(BASE_LOCAL_OUTPUT_DIR, exist_ok=True)
+        max_workers = MAX_WORKERS or min(len(tables_to_run), os.cpu_count() or 1)
+        logger.info(f"Base local output directory: {BASE_LOCAL_OUTPUT_DIR}")
+        logger.info(f"Casting NUMBER types to: NUMBER({CAST_PRECISION},{CAST_SCALE})")
+        logger.info(f"Parquet compression: {PARQUET_WRITER_OPTIONS['compression']}, row group size: {ROW_GROUP_SIZE} rows")
+        logger.info(f"Processing {len(tables_to_run)} table(s) with up to {max_workers} worker process(es).")
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker_logging, initargs=(LOG_QUEUE,)) as executor:
+            futures = {
+                executor.submit(
+                    pipeline_one_table,
+                    table_config,
+                    select_query,
+                    BASE_LOCAL_OUTPUT_DIR,
+                    FETCH_BATCH_SIZE,
+                    PARQUET_WRITER_OPTIONS,
+                    ROW_GROUP_SIZE
+                ): table_config
+                for table_config, _, _, select_query in tables_to_run
+            }
+            for future in as_completed(futures):
+                table_config = futures[future]
+                try:
+                    succeeded = future.result()
+                except Exception as e:
+                    logger.error(f"ERROR: Worker failed while processing {table_config.get('oracle_table_name')}: {e}")
+                    succeeded = False
+                if not succeeded:
+                    failed_tables.append(table_config.get("oracle_table_name"))
+
+    if failed_tables:
+        logger.warning(f"WARNING: {len(failed_tables)} table(s) did not complete: {', '.join(map(str, failed_tables))}")
+
+    logger.info("--- Script Finished ---")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,120 @@
+import importlib
+import os
+import random
+import shutil
+import time
+
+import oracledb
+import pytest
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture(scope="module")
+def run_all(tmp_path_factory):
+    """Imports run_all.py against the sample config, without Oracle Instant Client or real credentials."""
+    work_dir = tmp_path_factory.mktemp("run_all")
+    shutil.copy(os.path.join(SCRIPT_DIR, "sample_config.yaml"), work_dir / "config.yaml")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(work_dir)
+        for name in ("ORACLE_DB_USER", "ORACLE_DB_PASSWORD", "ORACLE_DB_DSN"):
+            mp.setenv(name, "test")
+        mp.setattr(oracledb, "init_oracle_client", lambda **kwargs: None)
+        mp.syspath_prepend(SCRIPT_DIR)
+        yield importlib.import_module("run_all")
+
+class BodyKeepingError(Exception):
+    """Mimics azure-core errors, which keep the failed request, and so its body, on the exception."""
+    def __init__(self, body):
+        super().__init__("append failed")
+        self.body = body
+
+class FakeFileClient:
+    """Stands in for a DataLakeFileClient; upload_data reads the stream in chunks like the SDK does."""
+    path_name = "Files/test/table.parquet"
+
+    def __init__(self, fail_from_offset=None):
+        self.fail_from_offset = fail_from_offset
+        self.uploaded = None
+        self.blocks = {}
+        self.flushed_size = None
+        self.deleted = False
+
+    def create_file(self):
+        self.blocks = {}
+
+    def append_data(self, data, offset, length):
+        time.sleep(random.random() / 100) # Let appends finish out of order
+        if self.fail_from_offset is not None and offset >= self.fail_from_offset:
+            raise BodyKeepingError(data)
+        assert len(data) == length
+        self.blocks[offset] = bytes(data)
+
+    def flush_data(self, offset):
+        self.flushed_size = offset
+        self.uploaded = b"".join(self.blocks[block_offset] for block_offset in sorted(self.blocks))
+
+    def delete_file(self):
+        self.deleted = True
+
+    def upload_data(self, data, length=None, overwrite=False, max_concurrency=1, chunk_size=4 * 1024 * 1024):
+        if isinstance(data, bytes):
+            self.uploaded = data
+            return
+        chunks = []
+        for offset in range(0, length, chunk_size):
+            chunk = data.read(chunk_size)
+            if self.fail_from_offset is not None and offset >= self.fail_from_offset:
+                raise BodyKeepingError(chunk)
+            chunks.append(chunk)
+        self.uploaded = b"".join(chunks)
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / "table.parquet"
+    path.write_bytes(os.urandom(5 * 1024 * 1024 // 2)) # 2.5 MiB: three 1 MiB blocks
+    return path
+
+def test_upload_local_file_uploads_whole_file(run_all, local_file):
+    client = FakeFileClient()
+    run_all.upload_local_file(client, str(local_file), 1, 4)
+    assert client.uploaded == local_file.read_bytes()
+
+def test_upload_local_file_uploads_empty_file(run_all, tmp_path):
+    empty_file = tmp_path / "empty.parquet"
+    empty_file.write_bytes(b"")
+    client = FakeFileClient()
+    run_all.upload_local_file(client, str(empty_file), 1, 4)
+    assert client.uploaded == b""
+
+def test_upload_local_file_raises_upload_error_that_keeps_its_body(run_all, local_file):
+    client = FakeFileClient(fail_from_offset=1024 * 1024)
+    with pytest.raises(BodyKeepingError):
+        run_all.upload_local_file(client, str(local_file), 1, 4)
+    assert client.uploaded is None
+
+def write_in_small_pieces(stream, data):
+    for start in range(0, len(data), 7777):
+        stream.write(data[start:start + 7777])
+
+def test_lakehouse_file_stream_appends_blocks_in_parallel(run_all, local_file):
+    data = local_file.read_bytes()
+    client = FakeFileClient()
+    stream = run_all.LakehouseFileStream(client, 1, 4)
+    write_in_small_pieces(stream, data)
+    stream.commit()
+    assert client.uploaded == data
+    assert client.flushed_size == len(data)
+
+def test_lakehouse_file_stream_abort_after_failed_append_deletes_file(run_all, local_file):
+    client = FakeFileClient(fail_from_offset=1024 * 1024)
+    stream = run_all.LakehouseFileStream(client, 1, 4)
+    with pytest.raises(BodyKeepingError):
+        write_in_small_pieces(stream, local_file.read_bytes())
+        stream.commit()
+    stream.abort()
+    assert client.flushed_size is None
+    assert client.deleted
+
+def test_tables_to_process_without_entries_means_no_tables(run_all):
+    settings = run_all.ProcessingSettings.model_validate({"tables_to_process": None})
+    assert settings.tables_to_process == []